@@ -4,17 +4,28 @@ Search and analyze UK companies using official Companies House data.
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-import json
+import numpy as np
+import orjson
 import os
+import asyncio
+import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+try:
+    import igraph
+except ImportError:
+    igraph = None  # fall back to the circular layout
+
 try:
     from utils.companies_house_api import CompaniesHouseAPI, CompanyProfile, Officer, PSC
 except ImportError:
@@ -30,7 +41,7 @@ st.set_page_config(
 )
 
 # Custom CSS for styling
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -77,7 +88,111 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Streamlit drops elements that a rerun doesn't re-emit, so the style block
+# is sent on every rerun; it is a module constant, so nothing is rebuilt
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+def api_key_hash(api_key):
+    """Hash the API key so the raw key never becomes a cache key"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+@st.cache_resource(show_spinner=False)
+def get_ch_api(key_hash, _api_key):
+    """Get a shared Companies House API client for the given key"""
+    return CompaniesHouseAPI(_api_key, use_sandbox=False)
+
+class UncachedResult(Exception):
+    """Raised by a cached fetcher to return a result without caching it"""
+    
+    def __init__(self, result):
+        super().__init__()
+        self.result = result
+
+def call_uncached_on_empty(fetcher, *args):
+    """Call a cached fetcher, passing through results it declined to cache"""
+    try:
+        return fetcher(*args)
+    except UncachedResult as e:
+        return e.result
+
+# The client reports failed requests as None (or an empty search or network),
+# and st.cache_data does not cache exceptions, so those results are raised out
+# of the cached fetchers below rather than served for the whole TTL after a
+# transient error
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_search_results(key_hash, _ch_api, query, max_results):
+    """Search companies, cached per (key, query, max_results)"""
+    companies = _ch_api.search_companies(query, items_per_page=max_results)
+    if not companies:
+        raise UncachedResult(companies)
+    return companies
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_company_details(key_hash, _ch_api, company_number):
+    """Get profile, officers and PSCs concurrently, cached per company"""
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        profile_future = executor.submit(_ch_api.get_company_profile, company_number)
+        officers_future = executor.submit(_ch_api.get_officers, company_number)
+        pscs_future = executor.submit(_ch_api.get_pscs, company_number)
+    
+    # result() re-raises the first failure from the worker threads
+    details = profile_future.result(), officers_future.result(), pscs_future.result()
+    
+    # None marks a failed request; empty officer or PSC lists are valid results
+    if any(part is None for part in details):
+        raise UncachedResult(details)
+    return details
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_company_network(key_hash, _ch_api, query, max_companies):
+    """Build a company network, cached per (key, query, max_companies)"""
+    network_data = asyncio.run(_ch_api.get_company_network_async(query, max_companies=max_companies))
+    if not network_data['nodes']['id']:
+        raise UncachedResult(network_data)
+    return network_data
+
+# Companies fetched when building a network graph
+NETWORK_MAX_COMPANIES = 5
+
+# Network node types, in trace order
+NODE_TYPES = ('Company', 'Person', 'PSC')
+
+# Marker colour for each network node type
+NODE_COLORS = {'Company': '#1f77b4', 'Person': '#ff7f0e', 'PSC': '#2ca02c'}
+
+# Built network figures kept in the process-wide cache (about 0.5 MB each at 3k nodes)
+NETWORK_FIGURE_CACHE_ENTRIES = 32
+
+# Node labels are drawn as SVG text, so skip them on larger graphs
+NETWORK_LABEL_LIMIT = 200
+
+# Hover fields (title, node attribute) for each network node type
+HOVER_FIELDS = {
+    'Company': (('Number', 'company_number'), ('Status', 'status'), ('Business', 'business_activity')),
+    'Person': (('Role', 'role'), ('Nationality', 'nationality'), ('Occupation', 'occupation')),
+    'PSC': (('Type', 'psc_type'), ('Country', 'country_of_residence')),
+}
+
+# Plotly hover templates; the browser fills them from each node's customdata
+HOVER_TEMPLATES = {
+    node_type: "<b>%{customdata[0]}</b>" + "".join(
+        f"<br>{title}: %{{customdata[{i}]}}" for i, (title, _) in enumerate(fields, start=1)
+    ) + "<extra></extra>"
+    for node_type, fields in HOVER_FIELDS.items()
+}
+
+# Officer/PSC lists longer than this render as a table instead of cards
+TABLE_VIEW_THRESHOLD = 25
+
+# Address fields shown, in display order
+ADDRESS_KEYS = ('address_line_1', 'address_line_2', 'locality', 'postal_code')
+
+def format_address(address):
+    """Join the non-empty address fields into a single line"""
+    return ', '.join(filter(None, (address.get(k) for k in ADDRESS_KEYS)))
 
 def init_session_state():
     """Initialize session state variables"""
@@ -87,91 +202,112 @@ def init_session_state():
         st.session_state.ch_company_details = {}
     if 'ch_network_data' not in st.session_state:
         st.session_state.ch_network_data = None
+    if 'ch_api_key_hash' not in st.session_state:
+        st.session_state.ch_api_key_hash = None
+
+def compute_network_layout(nodes_df, edge_idx):
+    """Compute node coordinates, force-directed when igraph is available"""
+    n_nodes = len(nodes_df)
+    
+    if igraph is not None:
+        graph = igraph.Graph(n=n_nodes, edges=edge_idx.tolist(), directed=False)
+        coords = np.asarray(graph.layout_fruchterman_reingold(niter=200).coords)
+        return coords[:, 0], coords[:, 1]
+    
+    # Simple circular layout for nodes, computed for all nodes at once
+    angles = np.linspace(0, 2 * np.pi, n_nodes, endpoint=False)
+    radii = np.where(nodes_df['type'].to_numpy() == 'Company', 100.0, 80.0)
+    return radii * np.cos(angles), radii * np.sin(angles)
 
 def create_network_visualization(graph_data):
     """Create an interactive network visualization using Plotly"""
-    if not graph_data or not graph_data['nodes']:
+    if not graph_data or not graph_data['nodes']['id']:
         return None
     
-    import math
-    nodes = graph_data['nodes']
     edges = graph_data['edges']
     
-    # Simple circular layout for nodes
-    n_nodes = len(nodes)
-    node_positions = {}
-    
-    for i, node in enumerate(nodes):
-        angle = 2 * math.pi * i / n_nodes
-        radius = 100 if node['type'] == 'Company' else 80
-        x = radius * math.cos(angle)
-        y = radius * math.sin(angle)
-        node_positions[node['id']] = (x, y)
-    
-    # Create edge traces
-    edge_x = []
-    edge_y = []
-    
-    for edge in edges:
-        source_pos = node_positions.get(edge['source'])
-        target_pos = node_positions.get(edge['target'])
-        
-        if source_pos and target_pos:
-            edge_x.extend([source_pos[0], target_pos[0], None])
-            edge_y.extend([source_pos[1], target_pos[1], None])
-    
-    edge_trace = go.Scatter(
+    # Nodes arrive as columns, so the frame is built without per-row dicts
+    nodes_df = pd.DataFrame(graph_data['nodes'])
+    node_count = len(nodes_df)
+    node_index = {node_id: i for i, node_id in enumerate(nodes_df['id'])}
+    
+    # Map edges to node indices with one lookup per endpoint (-1 if missing),
+    # then drop edges to nodes outside the graph
+    edge_count = len(edges['source'])
+    sources = np.fromiter((node_index.get(s, -1) for s in edges['source']), dtype=np.int64, count=edge_count)
+    targets = np.fromiter((node_index.get(t, -1) for t in edges['target']), dtype=np.int64, count=edge_count)
+    valid = (sources >= 0) & (targets >= 0)
+    edge_idx = np.column_stack((sources[valid], targets[valid]))
+    
+    # Reuse the layout stored with the network data so reruns skip the solver
+    layout = graph_data.get('layout')
+    if layout and len(layout['x']) == node_count:
+        node_xs, node_ys = np.asarray(layout['x']), np.asarray(layout['y'])
+    else:
+        node_xs, node_ys = compute_network_layout(nodes_df, edge_idx)
+        graph_data['layout'] = {'x': node_xs.tolist(), 'y': node_ys.tolist()}
+    
+    # Interleave source, target and a NaN gap so Plotly draws separate segments
+    edge_x = np.full(3 * len(edge_idx), np.nan)
+    edge_y = np.full(3 * len(edge_idx), np.nan)
+    edge_x[0::3], edge_x[1::3] = node_xs[edge_idx[:, 0]], node_xs[edge_idx[:, 1]]
+    edge_y[0::3], edge_y[1::3] = node_ys[edge_idx[:, 0]], node_ys[edge_idx[:, 1]]
+    
+    edge_trace = go.Scattergl(
         x=edge_x, y=edge_y,
         line=dict(width=2, color='#888'),
         hoverinfo='none',
         mode='lines'
     )
     
-    # Create node traces by type
+    # Marker sizes as one compact column shared by all node traces
+    node_sizes = nodes_df['size'].fillna(15).to_numpy(dtype=np.int16)
+    
+    # Create node traces by type, grouping the node rows in one pass
     node_traces = []
+    indices_by_type = nodes_df.groupby('type', sort=False).indices
     
-    for node_type in ['Company', 'Person', 'PSC']:
-        type_nodes = [n for n in nodes if n['type'] == node_type]
-        if not type_nodes:
+    for node_type in NODE_TYPES:
+        type_indices = indices_by_type.get(node_type)
+        if type_indices is None:
             continue
         
-        node_x = [node_positions[n['id']][0] for n in type_nodes]
-        node_y = [node_positions[n['id']][1] for n in type_nodes]
+        type_df = nodes_df.iloc[type_indices]
+        node_x = node_xs[type_indices]
+        node_y = node_ys[type_indices]
         
-        # Create hover text
-        hover_text = []
-        for node in type_nodes:
-            if node['type'] == 'Company':
-                text = f"<b>{node['label']}</b><br>"
-                text += f"Number: {node.get('company_number', 'N/A')}<br>"
-                text += f"Status: {node.get('status', 'N/A')}<br>"
-                text += f"Business: {node.get('business_activity', 'N/A')}"
-            elif node['type'] == 'Person':
-                text = f"<b>{node['label']}</b><br>"
-                text += f"Role: {node.get('role', 'N/A')}<br>"
-                text += f"Nationality: {node.get('nationality', 'N/A')}<br>"
-                text += f"Occupation: {node.get('occupation', 'N/A')}"
-            else:  # PSC
-                text = f"<b>{node['label']}</b><br>"
-                text += f"Type: {node.get('psc_type', 'N/A')}<br>"
-                text += f"Country: {node.get('country_of_residence', 'N/A')}"
-            hover_text.append(text)
+        # Ship the raw hover fields only; Plotly formats them client-side
+        hover_columns = ['label'] + [column for _, column in HOVER_FIELDS[node_type]]
+        hover_data = type_df.reindex(columns=hover_columns).fillna('N/A').to_numpy()
         
-        node_trace = go.Scatter(
+        # WebGL markers; labels need SVG text, so they get their own trace
+        node_trace = go.Scattergl(
             x=node_x, y=node_y,
-            mode='markers+text',
-            hoverinfo='text',
-            hovertext=hover_text,
-            text=[n['label'] for n in type_nodes],
-            textposition="middle center",
+            mode='markers',
+            customdata=hover_data,
+            hovertemplate=HOVER_TEMPLATES[node_type],
             name=node_type,
+            legendgroup=node_type,
             marker=dict(
-                size=[n.get('size', 15) for n in type_nodes],
-                color=type_nodes[0]['color'],
+                size=node_sizes[type_indices],
+                color=NODE_COLORS[node_type],
                 line=dict(width=2, color='white')
             )
         )
         node_traces.append(node_trace)
+        
+        # Text labels only stay legible (and cheap) on smaller graphs
+        if node_count <= NETWORK_LABEL_LIMIT:
+            label_trace = go.Scatter(
+                x=node_x, y=node_y,
+                mode='text',
+                hoverinfo='skip',
+                text=type_df['label'].tolist(),
+                textposition="middle center",
+                legendgroup=node_type,
+                showlegend=False
+            )
+            node_traces.append(label_trace)
     
     # Create the figure
     fig = go.Figure(data=[edge_trace] + node_traces,
@@ -198,45 +334,63 @@ def create_network_visualization(graph_data):
     
     return fig
 
+def render_json(data):
+    """Render data as indented JSON, serialized with orjson"""
+    st.code(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str).decode('utf-8'), language='json')
+
+def network_digest(graph_data):
+    """Hash the nodes and edges of a network to key the figure cache"""
+    payload = orjson.dumps(
+        {'nodes': graph_data['nodes'], 'edges': graph_data['edges']},
+        option=orjson.OPT_SORT_KEYS, default=str
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+@st.cache_data(ttl=3600, max_entries=NETWORK_FIGURE_CACHE_ENTRIES, show_spinner=False)
+def build_network_figure(digest, _graph_data):
+    """Build the network figure, cached per network digest"""
+    return create_network_visualization(_graph_data)
+
+@st.fragment
 def display_search_results(companies):
-    """Display company search results"""
+    """Display company search results; row selection reruns only this fragment"""
     if not companies:
         st.warning("No companies found matching your search criteria.")
         return
     
     st.subheader(f"🔍 Search Results ({len(companies)} companies found)")
     
-    for i, company in enumerate(companies):
-        with st.expander(f"🏢 {company.get('title', 'Unknown Company')} - {company.get('company_number', 'N/A')}", expanded=i==0):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.write(f"**Company Number:** {company.get('company_number', 'N/A')}")
-                st.write(f"**Status:** {company.get('company_status', 'N/A')}")
-                st.write(f"**Type:** {company.get('company_type', 'N/A')}")
-                st.write(f"**Incorporation Date:** {company.get('date_of_creation', 'N/A')}")
-            
-            with col2:
-                address = company.get('address', {})
-                if address:
-                    address_parts = [
-                        address.get('address_line_1', ''),
-                        address.get('address_line_2', ''),
-                        address.get('locality', ''),
-                        address.get('postal_code', '')
-                    ]
-                    full_address = ', '.join([part for part in address_parts if part])
-                    st.write(f"**Address:** {full_address}")
-                
-                description = company.get('description', '')
-                if description:
-                    st.write(f"**Description:** {description}")
-            
-            # Button to get detailed information
-            if st.button(f"📊 Get Detailed Info", key=f"detail_{company.get('company_number')}"):
-                company_number = company.get('company_number')
-                if company_number:
-                    get_company_details(company_number)
+    # One selectable table instead of an expander and button per result
+    results_df = pd.DataFrame([{
+        'Company Number': company.get('company_number', 'N/A'),
+        'Company Name': company.get('title', 'Unknown Company'),
+        'Status': company.get('company_status', 'N/A'),
+        'Type': company.get('company_type', 'N/A'),
+        'Incorporation Date': company.get('date_of_creation', 'N/A'),
+        'Address': format_address(company.get('address') or {}),
+        'Description': company.get('description', '')
+    } for company in companies])
+    
+    # Key the table by its result set so a new search never inherits the
+    # previous search's selected row
+    numbers = '\x1f'.join(company.get('company_number') or '' for company in companies)
+    table_key = f"ch_search_table_{hashlib.sha256(numbers.encode('utf-8')).hexdigest()[:16]}"
+    
+    st.caption("📊 Select a row to get detailed company information")
+    event = st.dataframe(
+        results_df,
+        on_select="rerun",
+        selection_mode="single-row",
+        use_container_width=True,
+        hide_index=True,
+        key=table_key
+    )
+    
+    rows = event.selection.rows
+    if rows and rows[0] < len(companies):
+        company_number = companies[rows[0]].get('company_number')
+        if company_number:
+            get_company_details(company_number)
 
 def get_company_details(company_number):
     """Get detailed company information"""
@@ -247,17 +401,16 @@ def get_company_details(company_number):
     
     with st.spinner("Fetching detailed company information..."):
         try:
-            ch_api = CompaniesHouseAPI(ch_api_key, use_sandbox=False)
+            key_hash = api_key_hash(ch_api_key)
+            ch_api = get_ch_api(key_hash, ch_api_key)
             
-            # Get company profile
-            profile = ch_api.get_company_profile(company_number)
-            officers = ch_api.get_officers(company_number)
-            pscs = ch_api.get_pscs(company_number)
+            # Get company profile, officers and PSCs in parallel
+            profile, officers, pscs = call_uncached_on_empty(fetch_company_details, key_hash, ch_api, company_number)
             
             st.session_state.ch_company_details[company_number] = {
                 'profile': profile,
-                'officers': officers,
-                'pscs': pscs
+                'officers': officers or [],
+                'pscs': pscs or []
             }
             
             # Display detailed information
@@ -331,14 +484,7 @@ def display_company_details(company_number):
         
         with col2:
             if profile.registered_address:
-                address_parts = [
-                    profile.registered_address.get('address_line_1', ''),
-                    profile.registered_address.get('address_line_2', ''),
-                    profile.registered_address.get('locality', ''),
-                    profile.registered_address.get('postal_code', '')
-                ]
-                full_address = ', '.join([part for part in address_parts if part])
-                st.write(f"**Registered Address:** {full_address}")
+                st.write(f"**Registered Address:** {format_address(profile.registered_address)}")
             
             if profile.sic_codes:
                 st.write(f"**SIC Codes:** {', '.join(profile.sic_codes)}")
@@ -349,33 +495,94 @@ def display_company_details(company_number):
     # Officers information
     if officers:
         with st.expander(f"👥 Officers & Directors ({len(officers)})", expanded=False):
-            for officer in officers:
-                st.markdown(f"""
-                <div class="officer-card">
-                    <strong>{officer.name}</strong> - {officer.role}<br>
-                    <small>
-                    Appointed: {officer.appointed_on or 'N/A'} | 
-                    Nationality: {officer.nationality or 'N/A'} | 
-                    Occupation: {officer.occupation or 'N/A'}
-                    </small>
-                </div>
-                """, unsafe_allow_html=True)
+            if len(officers) > TABLE_VIEW_THRESHOLD:
+                officers_df = pd.DataFrame([{
+                    'Name': officer.name,
+                    'Role': officer.role,
+                    'Appointed': officer.appointed_on,
+                    'Nationality': officer.nationality,
+                    'Occupation': officer.occupation
+                } for officer in officers])
+                st.dataframe(officers_df, use_container_width=True, hide_index=True)
+            else:
+                # One markdown element for all cards instead of one per officer
+                officer_cards = "".join(
+                    f'<div class="officer-card"><strong>{officer.name}</strong> - {officer.role}<br>'
+                    f'<small>Appointed: {officer.appointed_on or "N/A"} | '
+                    f'Nationality: {officer.nationality or "N/A"} | '
+                    f'Occupation: {officer.occupation or "N/A"}</small></div>'
+                    for officer in officers
+                )
+                st.markdown(officer_cards, unsafe_allow_html=True)
     
     # PSCs information
     if pscs:
         with st.expander(f"🎯 Persons with Significant Control ({len(pscs)})", expanded=False):
-            for psc in pscs:
-                control_nature = ', '.join(psc.nature_of_control) if psc.nature_of_control else 'N/A'
-                st.markdown(f"""
-                <div class="psc-card">
-                    <strong>{psc.name}</strong> - {psc.psc_type}<br>
-                    <small>
-                    Control: {control_nature}<br>
-                    Notified: {psc.notified_on or 'N/A'} | 
-                    Country: {psc.country_of_residence or 'N/A'}
-                    </small>
-                </div>
-                """, unsafe_allow_html=True)
+            if len(pscs) > TABLE_VIEW_THRESHOLD:
+                pscs_df = pd.DataFrame([{
+                    'Name': psc.name,
+                    'Type': psc.psc_type,
+                    'Control': ', '.join(psc.nature_of_control),
+                    'Notified': psc.notified_on,
+                    'Country': psc.country_of_residence
+                } for psc in pscs])
+                st.dataframe(pscs_df, use_container_width=True, hide_index=True)
+            else:
+                psc_cards = "".join(
+                    f'<div class="psc-card"><strong>{psc.name}</strong> - {psc.psc_type}<br>'
+                    f'<small>Control: {", ".join(psc.nature_of_control) if psc.nature_of_control else "N/A"}<br>'
+                    f'Notified: {psc.notified_on or "N/A"} | '
+                    f'Country: {psc.country_of_residence or "N/A"}</small></div>'
+                    for psc in pscs
+                )
+                st.markdown(psc_cards, unsafe_allow_html=True)
+
+def store_search_results(companies, status):
+    """Save search results to session state and report them in status"""
+    if companies:
+        st.session_state.ch_search_results = companies
+        status.success(f"✅ Found {len(companies)} companies!")
+    else:
+        status.warning("No companies found matching your search.")
+        st.session_state.ch_search_results = None
+
+def store_network_data(network_data, status):
+    """Save a network to session state and report it in status"""
+    if network_data and network_data['nodes']['id']:
+        st.session_state.ch_network_data = network_data
+        status.success("✅ Network graph created!")
+    else:
+        status.warning("Could not create network graph.")
+
+def run_full_analysis(key_hash, api_key, search_query, max_results):
+    """Search companies and build the network graph concurrently"""
+    ch_api = get_ch_api(key_hash, api_key)
+    search_status = st.sidebar.empty()
+    network_status = st.sidebar.empty()
+    search_status.info("Searching Companies House database...")
+    network_status.info("Building company network graph...")
+    
+    # Worker threads need the script context to use the cached fetchers
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        pending = {
+            executor.submit(call_uncached_on_empty, fetch_search_results, key_hash, ch_api, search_query, max_results): 'search',
+            executor.submit(call_uncached_on_empty, fetch_company_network, key_hash, ch_api, search_query, NETWORK_MAX_COMPANIES): 'network'
+        }
+        
+        # Report each task as soon as it finishes
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                status = search_status if task == 'search' else network_status
+                try:
+                    if task == 'search':
+                        store_search_results(future.result(), status)
+                    else:
+                        store_network_data(future.result(), status)
+                except Exception as e:
+                    status.error(f"{task.capitalize()} error: {str(e)}")
 
 def main():
     """Main function for the UK Company Database"""
@@ -403,6 +610,12 @@ def main():
     
     if api_key:
         st.session_state.ch_api_key = api_key
+        key_hash = api_key_hash(api_key)
+        
+        # Drop details fetched with a previous key
+        if st.session_state.ch_api_key_hash != key_hash:
+            st.session_state.ch_api_key_hash = key_hash
+            st.session_state.ch_company_details = {}
     
     # Search input
     search_query = st.sidebar.text_input(
@@ -429,15 +642,9 @@ def main():
         else:
             with st.spinner("Searching Companies House database..."):
                 try:
-                    ch_api = CompaniesHouseAPI(api_key, use_sandbox=False)
-                    companies = ch_api.search_companies(search_query, items_per_page=max_results)
-                    
-                    if companies:
-                        st.session_state.ch_search_results = companies
-                        st.sidebar.success(f"✅ Found {len(companies)} companies!")
-                    else:
-                        st.sidebar.warning("No companies found matching your search.")
-                        st.session_state.ch_search_results = None
+                    ch_api = get_ch_api(key_hash, api_key)
+                    companies = call_uncached_on_empty(fetch_search_results, key_hash, ch_api, search_query, max_results)
+                    store_search_results(companies, st.sidebar)
                         
                 except Exception as e:
                     st.sidebar.error(f"Search error: {str(e)}")
@@ -451,18 +658,22 @@ def main():
         else:
             with st.spinner("Building company network graph..."):
                 try:
-                    ch_api = CompaniesHouseAPI(api_key, use_sandbox=False)
-                    network_data = ch_api.get_company_network(search_query, max_companies=5)
-                    
-                    if network_data and network_data['nodes']:
-                        st.session_state.ch_network_data = network_data
-                        st.sidebar.success("✅ Network graph created!")
-                    else:
-                        st.sidebar.warning("Could not create network graph.")
+                    ch_api = get_ch_api(key_hash, api_key)
+                    network_data = call_uncached_on_empty(fetch_company_network, key_hash, ch_api, search_query, NETWORK_MAX_COMPANIES)
+                    store_network_data(network_data, st.sidebar)
                         
                 except Exception as e:
                     st.sidebar.error(f"Network error: {str(e)}")
     
+    # Combined analysis button
+    if st.sidebar.button("🚀 Run Full Analysis", help="Search companies and build the network graph at the same time"):
+        if not api_key:
+            st.sidebar.error("Please enter your Companies House API key")
+        elif not search_query:
+            st.sidebar.error("Please enter a company name")
+        else:
+            run_full_analysis(key_hash, api_key, search_query, max_results)
+    
     # Display results
     if st.session_state.ch_search_results:
         display_search_results(st.session_state.ch_search_results)
@@ -476,31 +687,29 @@ def main():
         
         # Network summary
         col1, col2, col3, col4 = st.columns(4)
+        type_counts = Counter(network_data['nodes']['type'])
         
         with col1:
-            companies_count = len([n for n in network_data['nodes'] if n['type'] == 'Company'])
-            st.metric("Companies", companies_count)
+            st.metric("Companies", type_counts['Company'])
         
         with col2:
-            people_count = len([n for n in network_data['nodes'] if n['type'] == 'Person'])
-            st.metric("Directors/Officers", people_count)
+            st.metric("Directors/Officers", type_counts['Person'])
         
         with col3:
-            psc_count = len([n for n in network_data['nodes'] if n['type'] == 'PSC'])
-            st.metric("PSCs/UBOs", psc_count)
+            st.metric("PSCs/UBOs", type_counts['PSC'])
         
         with col4:
-            relationships_count = len(network_data['edges'])
+            relationships_count = len(network_data['edges']['source'])
             st.metric("Relationships", relationships_count)
         
         # Network visualization
-        fig = create_network_visualization(network_data)
+        fig = build_network_figure(network_digest(network_data), network_data)
         if fig:
             st.plotly_chart(fig, use_container_width=True)
         
         # Network data in accordion
         with st.expander("📊 Network Data Details", expanded=False):
-            st.json(network_data['metadata'])
+            render_json(network_data['metadata'])
     
     # Help and information
     if not st.session_state.ch_search_results and not st.session_state.ch_network_data:
@@ -514,8 +723,9 @@ def main():
             
             1. **API Key**: Enter your Companies House API key in the sidebar
             2. **Search**: Enter a UK company name (e.g., "Tesco PLC", "BP PLC") or company number
-            3. **Results**: Browse search results and click "Get Detailed Info" for comprehensive analysis
+            3. **Results**: Browse search results and select a row for comprehensive analysis
             4. **Network**: Use "Build Network Graph" to visualize company relationships and ownership structures
+            5. **Full Analysis**: Use "Run Full Analysis" to search and build the network graph in one go
             
             ### What You Can Discover
             
@@ -5,20 +5,111 @@ This module provides functionality to interact with the UK Companies House API
 to retrieve company information, directors, and persons with significant control (PSCs).
 """
 
+import asyncio
+import atexit
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import hashlib
 import time
 import os
-from typing import Dict, List, Optional, Any
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, ClassVar, Dict, Final, Iterable, Iterator, List, Mapping, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
+from types import MappingProxyType, ModuleType
+from functools import lru_cache
 import logging
 
+from .response_cache import ResponseCache
+
+# httpx with h2, or None to fall back to threaded requests
+httpx: Optional[ModuleType]
+try:
+    import httpx as _httpx
+    import h2  # noqa: F401 - needed by httpx for HTTP/2
+    httpx = _httpx
+except ImportError:
+    httpx = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# httpx logs every request at INFO; keep only its warnings and errors
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+# Headers sent with every API request
+DEFAULT_HEADERS = {
+    'Accept': 'application/json',
+    'User-Agent': 'UK-Company-DB/1.0'
+}
+
+# Columns of the network node and edge tables built by get_company_network
+NODE_COLUMNS = (
+    'id', 'label', 'type', 'size', 'color',
+    'company_number', 'status', 'incorporation_date', 'sic_codes', 'business_activity',
+    'role', 'nationality', 'occupation', 'psc_type', 'country_of_residence'
+)
+EDGE_COLUMNS = ('source', 'target', 'relationship', 'role', 'appointed_on', 'nature_of_control', 'notified_on')
+
+# Shared read-only stand-in for missing nested objects in API responses
+_EMPTY: Dict[str, Any] = {}
+
+# Returned by _fetch when the API confirms a cached response is unchanged (304)
+_NOT_MODIFIED = object()
+
+# Seconds to back off after a 429 response without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 60.0
+
+# Transient gateway errors are retried with exponential backoff on both the
+# requests and HTTP/2 paths; connection errors are retried by the transports
+RETRY_STATUSES = frozenset({502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# Worker threads used to fetch companies when building a network
+NETWORK_FETCH_WORKERS = 8
+
+# Companies House quota of 600 requests per 5 minutes, as a token bucket
+# refilling one token every 500 ms
+RATE_LIMIT_CAPACITY = 600
+RATE_LIMIT_INTERVAL_NS = 500_000_000
+
+# Maximum HTTP requests in flight per API key, kept below the pool size so
+# bursts never open connections the pool would have to discard
+MAX_CONCURRENT_REQUESTS = 16
+
+# Response cache location and lifetimes (seconds); search results are never cached
+DEFAULT_CACHE_PATH = os.path.join('.ch_cache', 'responses.sqlite')
+PROFILE_CACHE_TTL = 24 * 60 * 60
+OFFICERS_CACHE_TTL = 6 * 60 * 60
+PSCS_CACHE_TTL = 6 * 60 * 60
+
+# Endpoint path templates, bound once so hot paths only format the company number
+_COMPANY_PATH = '/company/{}'.format
+_OFFICERS_PATH = '/company/{}/officers'.format
+_PSCS_PATH = '/company/{}/persons-with-significant-control'.format
+
+# Descriptions for common SIC codes (simplified mapping), read-only
+_SIC_DESCRIPTIONS: Final[Mapping[str, str]] = MappingProxyType({
+    '70100': 'Activities of head offices',
+    '64191': 'Banks',
+    '64209': 'Other credit granting',
+    '68100': 'Buying and selling of own real estate',
+    '68209': 'Other letting and operating of own or leased real estate',
+    '70229': 'Management consultancy activities other than financial management',
+    '82990': 'Other business support service activities n.e.c.'
+})
+
+# Advanced search fields required to build a profile without fetching it
+PROFILE_SEARCH_FIELDS = ('company_number', 'company_status', 'date_of_creation', 'company_type', 'registered_office_address')
+
+@dataclass(slots=True, frozen=True)
 class CompanyProfile:
     """Data class for company profile information"""
     company_number: str
@@ -30,7 +121,7 @@ class CompanyProfile:
     registered_address: Dict[str, str]
     business_activity: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Officer:
     """Data class for company officer information"""
     officer_id: str
@@ -42,7 +133,7 @@ class Officer:
     occupation: Optional[str]
     country_of_residence: Optional[str]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PSC:
     """Data class for Person with Significant Control"""
     psc_id: str
@@ -53,18 +144,72 @@ class PSC:
     country_of_residence: Optional[str]
     nationality: Optional[str]
 
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter, kept as integer nanoseconds of credit
+    """
+    
+    def __init__(self, capacity: int, interval_ns: int):
+        """
+        Initialize a full bucket
+        
+        Args:
+            capacity (int): Maximum burst of requests
+            interval_ns (int): Nanoseconds to refill one token
+        """
+        self._interval_ns = interval_ns
+        self._capacity_ns = capacity * interval_ns
+        self._credit_ns = self._capacity_ns
+        self._last_refill_ns = time.monotonic_ns()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take a token from the bucket, sleeping only when it is empty"""
+        with self._lock:
+            now = time.monotonic_ns()
+            self._credit_ns = min(self._capacity_ns, self._credit_ns + now - self._last_refill_ns)
+            self._last_refill_ns = now
+            
+            if self._credit_ns >= self._interval_ns:
+                self._credit_ns -= self._interval_ns
+                return
+            
+            time.sleep((self._interval_ns - self._credit_ns) / 1e9)
+            self._credit_ns = 0
+            self._last_refill_ns = time.monotonic_ns()
+    
+    def drain(self, retry_after: float):
+        """Empty the bucket so the next request waits out a server-side throttle"""
+        with self._lock:
+            self._credit_ns = -int(retry_after * 1e9)
+            self._last_refill_ns = time.monotonic_ns()
+
+@dataclass(slots=True)
+class _SharedClientState:
+    """Connection pool, rate limits and response caches shared by all clients of one API key"""
+    session: requests.Session
+    rate_limiter: TokenBucket
+    concurrency: threading.BoundedSemaphore
+    caches: Dict[Optional[str], ResponseCache]
+
 class CompaniesHouseAPI:
     """
     Companies House API client for retrieving UK company information
     """
     
-    def __init__(self, api_key: str, use_sandbox: bool = False):
+    # State shared by all clients with the same base URL and API key, so
+    # short-lived clients reuse warm pooled connections and one quota
+    _shared: ClassVar[Dict[Tuple[str, str], _SharedClientState]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+    
+    def __init__(self, api_key: str, use_sandbox: bool = False, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
         """
         Initialize the Companies House API client
         
         Args:
             api_key (str): Your Companies House API key
             use_sandbox (bool): Whether to use sandbox environment
+            cache_path (str): SQLite file for cached responses; in-memory only if None
         """
         self.api_key = api_key
         self.use_sandbox = use_sandbox
@@ -73,47 +218,175 @@ class CompaniesHouseAPI:
             self.base_url = "https://api-sandbox.company-information.service.gov.uk"
         else:
             self.base_url = "https://api.company-information.service.gov.uk"
-        self.session = requests.Session()
-        self.session.auth = (api_key, '')  # Basic auth with API key as username
-        self.session.headers.update({
-            'Accept': 'application/json',
-            'User-Agent': 'UK-Company-DB/1.0'
-        })
-        
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        
+        state = self._shared_state(self.base_url, api_key)
+        self.session = state.session
+        
+        # Rate limiting: token bucket matching the 600 requests / 5 minutes quota,
+        # plus a cap on requests in flight
+        self._rate_limiter = state.rate_limiter
+        self._concurrency = state.concurrency
+        
+        with self._shared_lock:
+            cache = state.caches.get(cache_path)
+            if cache is None:
+                cache = state.caches[cache_path] = ResponseCache(cache_path)
+        self.cache = cache
     
-    def _rate_limit(self):
-        """Implement basic rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+    @classmethod
+    def _shared_state(cls, base_url: str, api_key: str) -> _SharedClientState:
+        """
+        Get the process-wide state for a base URL and API key, creating it on first use
+        
+        Args:
+            base_url (str): API base URL
+            api_key (str): Companies House API key
+            
+        Returns:
+            _SharedClientState: Session, rate limits and response caches for the key
+        """
+        key = (base_url, hashlib.blake2b(api_key.encode('utf-8'), digest_size=8).hexdigest())
+        with cls._shared_lock:
+            state = cls._shared.get(key)
+            if state is None:
+                session = requests.Session()
+                session.auth = (api_key, '')  # Basic auth with API key as username
+                
+                # Keep a warm connection pool large enough for concurrent fetches,
+                # retrying connection errors with backoff
+                adapter = HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=32,
+                    max_retries=Retry(total=MAX_RETRIES, backoff_factor=RETRY_BACKOFF, allowed_methods=['GET'])
+                )
+                session.mount('https://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                atexit.register(session.close)
+                
+                state = cls._shared[key] = _SharedClientState(
+                    session,
+                    TokenBucket(RATE_LIMIT_CAPACITY, RATE_LIMIT_INTERVAL_NS),
+                    threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS),
+                    {}
+                )
+        return state
     
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None,
+                      cache_ttl: Optional[float] = None, force_refresh: bool = False) -> Optional[Dict]:
         """
         Make a request to the Companies House API
         
         Args:
             endpoint (str): API endpoint
             params (dict): Query parameters
+            cache_ttl (float): Seconds a cached response stays valid; not cached if None
+            force_refresh (bool): Ignore cache freshness and revalidate with the API
             
         Returns:
             dict: API response data or None if error
         """
-        self._rate_limit()
+        url = self.base_url + endpoint
         
-        url = f"{self.base_url}{endpoint}"
+        if cache_ttl is None:
+            return self._fetch(url, params)[0]
         
-        try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            return None
+        cache_key = ResponseCache.make_key(url, params)
+        entry = self.cache.get_entry(cache_key)
+        if entry is not None and self._is_fresh(entry[0], cache_ttl, force_refresh):
+            return entry[1]
+        
+        data, etag = self._fetch(url, params, entry[2] if entry is not None else None)
+        return self._store_response(cache_key, entry, data, etag)
+    
+    @staticmethod
+    def _is_fresh(stored_at: float, cache_ttl: float, force_refresh: bool = False) -> bool:
+        """Whether a cache entry stored at stored_at can be served without asking the API"""
+        return not force_refresh and time.time() - stored_at <= cache_ttl
+    
+    def _store_response(self, cache_key: str, entry: Optional[Tuple[float, Any, Optional[str]]],
+                        data: Optional[Any], etag: Optional[str]) -> Optional[Any]:
+        """
+        Cache a fetched response and return the data to use
+        
+        Args:
+            cache_key (str): Cache key of the request
+            entry (tuple): Stale cache entry that was revalidated, if any
+            data: Fetched data, _NOT_MODIFIED on a 304, or None if error
+            etag (str): Response ETag
+            
+        Returns:
+            API response data or None if error
+        """
+        # A 304 confirms the stale entry, so reuse its body
+        if data is _NOT_MODIFIED and entry is not None:
+            self.cache.touch(cache_key)
+            return entry[1]
+        if data is not None:
+            self.cache.set(cache_key, data, etag)
+        return data
+    
+    def _read_response(self, response: Any, attempt: int,
+                       etag: Optional[str] = None) -> Union[Tuple[Any, Optional[str]], float]:
+        """
+        Interpret a requests or httpx response
+        
+        Args:
+            response: HTTP response
+            attempt (int): Zero-based attempt number of the request
+            etag (str): ETag sent as If-None-Match, if any
+            
+        Returns:
+            tuple: (API response data, or _NOT_MODIFIED on a 304; response ETag),
+                or seconds to wait before retrying
+        """
+        # Throttled: wait for Retry-After (the bucket enforces it), then retry once
+        if response.status_code == 429 and attempt == 0:
+            retry_header = response.headers.get('Retry-After', '')
+            retry_after = float(retry_header) if retry_header.isdigit() else DEFAULT_RETRY_AFTER
+            logger.warning(f"Rate limited by API, retrying in {retry_after:.0f}s")
+            self._rate_limiter.drain(retry_after)
+            return 0.0
+        
+        # Transient gateway error: back off exponentially and retry
+        if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+            return RETRY_BACKOFF * 2 ** attempt
+        
+        if response.status_code == 304 and etag:
+            return _NOT_MODIFIED, etag
+        
+        response.raise_for_status()
+        return orjson.loads(response.content), response.headers.get('ETag')
+    
+    def _fetch(self, url: str, params: Optional[Dict] = None,
+               etag: Optional[str] = None) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Fetch a URL from the Companies House API, bypassing the cache
+        
+        Args:
+            url (str): Full request URL
+            params (dict): Query parameters
+            etag (str): ETag of a cached copy, sent as If-None-Match
+            
+        Returns:
+            tuple: (API response data, or _NOT_MODIFIED on a 304, or None if error; response ETag)
+        """
+        headers = {'If-None-Match': etag} if etag else None
+        
+        for attempt in range(MAX_RETRIES + 1):
+            self._rate_limiter.acquire()
+            
+            try:
+                with self._concurrency:
+                    response = self.session.get(url, params=params, headers=headers, timeout=10)
+                result = self._read_response(response, attempt, etag)
+            except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+                logger.error(f"API request failed: {e}")
+                return None, None
+            
+            if isinstance(result, tuple):
+                return result
+            time.sleep(result)
+        return None, None
     
     def search_companies(self, query: str, items_per_page: int = 20) -> List[Dict]:
         """
@@ -136,131 +409,243 @@ class CompaniesHouseAPI:
             return response['items']
         return []
     
-    def get_company_profile(self, company_number: str) -> Optional[CompanyProfile]:
+    def get_company_profile(self, company_number: str, force_refresh: bool = False) -> Optional[CompanyProfile]:
         """
         Get detailed company profile
         
         Args:
             company_number (str): Company registration number
+            force_refresh (bool): Bypass the response cache
             
         Returns:
             CompanyProfile: Company profile data or None
         """
-        response = self._make_request(f'/company/{company_number}')
+        response = self._make_request(_COMPANY_PATH(company_number), cache_ttl=PROFILE_CACHE_TTL,
+                                      force_refresh=force_refresh)
+        return self._parse_company_profile(response)
+    
+    @staticmethod
+    def _parse_company_profile(response: Optional[Dict]) -> Optional[CompanyProfile]:
+        """Build a CompanyProfile from a company profile response"""
         if not response:
             return None
         
-        # Extract SIC codes and business activity
-        sic_codes = []
-        business_activity = None
+        get = response.get
         
-        if 'sic_codes' in response:
-            sic_codes = response['sic_codes']
-        
-        # Try to get business activity from various fields
-        if 'business_activity' in response:
-            business_activity = response['business_activity']
-        elif sic_codes:
+        # Business activity, falling back to the SIC codes
+        sic_codes = get('sic_codes') or []
+        business_activity = get('business_activity')
+        if business_activity is None and sic_codes:
             business_activity = f"SIC codes: {', '.join(sic_codes)}"
         
         return CompanyProfile(
-            company_number=response.get('company_number', ''),
-            company_name=response.get('company_name', ''),
-            company_status=response.get('company_status', ''),
-            incorporation_date=response.get('date_of_creation'),
-            company_type=response.get('type', ''),
-            sic_codes=sic_codes,
-            registered_address=response.get('registered_office_address', {}),
-            business_activity=business_activity
+            get('company_number', ''),
+            get('company_name', ''),
+            get('company_status', ''),
+            get('date_of_creation'),
+            get('type', ''),
+            sic_codes,
+            get('registered_office_address', {}),
+            business_activity
         )
     
-    def get_officers(self, company_number: str) -> List[Officer]:
+    def get_officers(self, company_number: str, force_refresh: bool = False) -> Optional[List[Officer]]:
         """
         Get company officers (directors, secretaries, etc.)
         
         Args:
             company_number (str): Company registration number
+            force_refresh (bool): Bypass the response cache
             
         Returns:
-            list: List of Officer objects
-        """
-        response = self._make_request(f'/company/{company_number}/officers')
-        if not response or 'items' not in response:
-            return []
-        
-        officers = []
-        for item in response['items']:
-            officer = Officer(
-                officer_id=item.get('links', {}).get('officer', {}).get('appointments', '').split('/')[-2] if item.get('links', {}).get('officer', {}).get('appointments') else '',
-                name=item.get('name', ''),
-                role=item.get('officer_role', ''),
-                appointed_on=item.get('appointed_on'),
-                resigned_on=item.get('resigned_on'),
-                nationality=item.get('nationality'),
-                occupation=item.get('occupation'),
-                country_of_residence=item.get('country_of_residence')
-            )
-            officers.append(officer)
+            list: List of Officer objects, empty if the company has none, or None if the request failed
+        """
+        response = self._make_request(_OFFICERS_PATH(company_number), cache_ttl=OFFICERS_CACHE_TTL,
+                                      force_refresh=force_refresh)
+        return self._parse_officers(response)
+    
+    @staticmethod
+    def _parse_officers(response: Optional[Dict]) -> Optional[List[Officer]]:
+        """Build Officer objects from an officers list response; None if the request failed"""
+        if response is None:
+            return None
+        
+        items = response.get('items') or []
+        officers: List[Officer] = []
+        for item in items:
+            # Officer ID is the second-to-last segment of the appointments link
+            links = item.get('links') or _EMPTY
+            appointments = (links.get('officer') or _EMPTY).get('appointments') or ''
+            link_parts = appointments.rsplit('/', 2)
+            officer_id = link_parts[-2] if len(link_parts) > 1 else ''
+            
+            get = item.get
+            officers.append(Officer(
+                officer_id,
+                get('name', ''),
+                sys.intern(get('officer_role') or ''),
+                get('appointed_on'),
+                get('resigned_on'),
+                _intern(get('nationality')),
+                get('occupation'),
+                _intern(get('country_of_residence'))
+            ))
         
         return officers
     
-    def get_pscs(self, company_number: str) -> List[PSC]:
+    def get_pscs(self, company_number: str, force_refresh: bool = False) -> Optional[List[PSC]]:
         """
         Get Persons with Significant Control (Ultimate Beneficial Owners)
         
         Args:
             company_number (str): Company registration number
+            force_refresh (bool): Bypass the response cache
             
         Returns:
-            list: List of PSC objects
+            list: List of PSC objects, empty if the company has none, or None if the request failed
         """
-        response = self._make_request(f'/company/{company_number}/persons-with-significant-control')
-        if not response or 'items' not in response:
-            return []
+        response = self._make_request(_PSCS_PATH(company_number),
+                                      cache_ttl=PSCS_CACHE_TTL, force_refresh=force_refresh)
+        return self._parse_pscs(response)
+    
+    @staticmethod
+    def _parse_pscs(response: Optional[Dict]) -> Optional[List[PSC]]:
+        """Build PSC objects from a PSC list response; None if the request failed"""
+        if response is None:
+            return None
         
-        pscs = []
-        for item in response['items']:
-            # Determine PSC type and extract ID
-            psc_type = 'individual'
-            psc_id = ''
+        items = response.get('items') or []
+        pscs: List[PSC] = []
+        for item in items:
+            get = item.get
             
-            if 'kind' in item:
-                if 'corporate-entity' in item['kind']:
-                    psc_type = 'corporate-entity'
-                elif 'legal-person' in item['kind']:
-                    psc_type = 'legal-person'
+            # Determine PSC type
+            kind = get('kind') or ''
+            if 'corporate-entity' in kind:
+                psc_type = 'corporate-entity'
+            elif 'legal-person' in kind:
+                psc_type = 'legal-person'
+            else:
+                psc_type = 'individual'
             
             # Extract PSC ID from links
-            if 'links' in item and 'self' in item['links']:
-                psc_id = item['links']['self'].split('/')[-1]
-            
-            psc = PSC(
-                psc_id=psc_id,
-                name=item.get('name', ''),
-                psc_type=psc_type,
-                nature_of_control=item.get('natures_of_control', []),
-                notified_on=item.get('notified_on'),
-                country_of_residence=item.get('country_of_residence'),
-                nationality=item.get('nationality')
-            )
-            pscs.append(psc)
+            self_link = (get('links') or _EMPTY).get('self') or ''
+            psc_id = self_link.rsplit('/', 1)[-1]
+            
+            pscs.append(PSC(
+                psc_id,
+                get('name', ''),
+                psc_type,
+                get('natures_of_control', []),
+                get('notified_on'),
+                _intern(get('country_of_residence')),
+                _intern(get('nationality'))
+            ))
         
         return pscs
     
-    def get_company_network(self, company_name: str, max_companies: int = 10) -> Dict[str, Any]:
+    def _fetch_company_bundle(self, company_number: str, profile: Optional[CompanyProfile] = None) -> Tuple[Optional[CompanyProfile], List[Officer], List[PSC]]:
         """
-        Build a network of related companies based on shared directors and PSCs
+        Fetch the profile, officers and PSCs of a single company
+        
+        Args:
+            company_number (str): Company registration number
+            profile (CompanyProfile): Profile already known from search; fetched if None
+            
+        Returns:
+            tuple: (profile, officers, pscs); officers and PSCs are empty if no profile
+        """
+        if profile is None:
+            profile = self.get_company_profile(company_number)
+        if not profile:
+            return None, [], []
+        return profile, self.get_officers(company_number) or [], self.get_pscs(company_number) or []
+    
+    def advanced_search_companies(self, company_name: str, size: int = 20) -> List[Dict]:
+        """
+        Search for companies by name with the advanced search API
+        
+        Unlike search_companies, results carry profile-grade fields
+        (type, SIC codes, registered office address).
+        
+        Args:
+            company_name (str): Text the company name must include
+            size (int): Maximum number of results
+            
+        Returns:
+            list: List of company search results
+        """
+        params = {
+            'company_name_includes': company_name,
+            'size': size
+        }
+        
+        response = self._make_request('/advanced-search/companies', params)
+        if response and 'items' in response:
+            return response['items']
+        return []
+    
+    @classmethod
+    def _profile_from_search(cls, item: Dict) -> Optional[CompanyProfile]:
+        """
+        Build a CompanyProfile from an advanced search result
+        
+        Args:
+            item (dict): Advanced search result
+            
+        Returns:
+            CompanyProfile: Profile, or None if required fields are missing
+        """
+        if not all(item.get(field) for field in PROFILE_SEARCH_FIELDS):
+            return None
+        return cls._parse_company_profile({**item, 'type': item['company_type']})
+    
+    def _network_seed_companies(self, company_name: str, max_companies: int) -> List[Tuple[str, Optional[CompanyProfile]]]:
+        """
+        Search for the starting companies of a network
+        
+        Seeds are the ranked results of the standard search, so the network
+        covers the same companies as the search results table. The advanced
+        search is a substring filter with its own ordering, so it is only used
+        to take profiles for those same companies without fetching them.
         
         Args:
             company_name (str): Starting company name
             max_companies (int): Maximum number of companies to include
             
         Returns:
-            dict: Network data with nodes and edges
+            list: (company_number, profile or None) tuples in search order
+        """
+        companies = self.search_companies(company_name, items_per_page=max_companies)
+        profiles = {}
+        if companies:
+            for item in self.advanced_search_companies(company_name, size=max_companies):
+                company_number = item.get('company_number')
+                if company_number and company_number not in profiles:
+                    profiles[company_number] = self._profile_from_search(item)
+        
+        seeds = {}
+        for company_data in companies[:max_companies]:
+            company_number = company_data.get('company_number')
+            if company_number and company_number not in seeds:
+                seeds[company_number] = profiles.get(company_number)
+        return list(seeds.items())
+    
+    def _assemble_network(self, company_name: str, bundles: Iterable[Tuple[str, Optional[CompanyProfile], List[Officer], List[PSC]]]) -> Dict[str, Any]:
+        """
+        Build network nodes and edges from fetched company bundles
+        
+        Args:
+            company_name (str): Starting company name
+            bundles (iterable): (company_number, profile, officers, pscs) tuples,
+                consumed once and in order
+            
+        Returns:
+            dict: Network data with columnar nodes and edges
         """
-        network = {
-            'nodes': [],
-            'edges': [],
+        network: Dict[str, Any] = {
+            'nodes': {column: [] for column in NODE_COLUMNS},
+            'edges': {column: [] for column in EDGE_COLUMNS},
             'metadata': {
                 'search_query': company_name,
                 'timestamp': datetime.now().isoformat(),
@@ -269,21 +654,14 @@ class CompaniesHouseAPI:
             }
         }
         
-        # Search for the main company
-        companies = self.search_companies(company_name, items_per_page=max_companies)
-        if not companies:
-            return network
-        
-        processed_companies = set()
-        processed_people = set()
+        # Identity key -> node ID; officers are keyed on their officer ID when
+        # the API links one, and like PSCs on (casefolded name, country of
+        # residence) otherwise
+        person_ids: Dict[Tuple[str, ...], str] = {}
+        psc_ids: Dict[Tuple[str, str], str] = {}
+        total_companies = 0
         
-        for company_data in companies[:max_companies]:
-            company_number = company_data.get('company_number')
-            if not company_number or company_number in processed_companies:
-                continue
-            
-            # Get detailed company information
-            profile = self.get_company_profile(company_number)
+        for company_number, profile, officers, pscs in bundles:
             if not profile:
                 continue
             
@@ -300,16 +678,19 @@ class CompaniesHouseAPI:
                 'size': 20,
                 'color': '#1f77b4'
             }
-            network['nodes'].append(company_node)
-            processed_companies.add(company_number)
+            _append_row(network['nodes'], company_node)
+            total_companies += 1
             
-            # Get officers
-            officers = self.get_officers(company_number)
             for officer in officers:
-                person_id = f"person_{officer.name.replace(' ', '_').lower()}"
+                person_key: Tuple[str, ...] = (
+                    (officer.officer_id,) if officer.officer_id
+                    else (officer.name.casefold(), officer.country_of_residence or '')
+                )
+                person_id = person_ids.get(person_key)
                 
-                if person_id not in processed_people:
+                if person_id is None:
                     # Add person node
+                    person_id = person_ids[person_key] = _node_id('person', person_key)
                     person_node = {
                         'id': person_id,
                         'label': officer.name,
@@ -320,26 +701,25 @@ class CompaniesHouseAPI:
                         'size': 15,
                         'color': '#ff7f0e'
                     }
-                    network['nodes'].append(person_node)
-                    processed_people.add(person_id)
+                    _append_row(network['nodes'], person_node)
                 
                 # Add relationship edge
-                edge = {
+                edge: Dict[str, Any] = {
                     'source': person_id,
                     'target': f"company_{company_number}",
                     'relationship': f"DIRECTOR_OF",
                     'role': officer.role,
                     'appointed_on': officer.appointed_on
                 }
-                network['edges'].append(edge)
+                _append_row(network['edges'], edge)
             
-            # Get PSCs
-            pscs = self.get_pscs(company_number)
             for psc in pscs:
-                psc_id = f"psc_{psc.name.replace(' ', '_').lower()}"
+                psc_key = (psc.name.casefold(), psc.country_of_residence or '')
+                psc_id = psc_ids.get(psc_key)
                 
-                if psc_id not in processed_people:
+                if psc_id is None:
                     # Add PSC node
+                    psc_id = psc_ids[psc_key] = _node_id('psc', psc_key)
                     psc_node = {
                         'id': psc_id,
                         'label': psc.name,
@@ -350,8 +730,7 @@ class CompaniesHouseAPI:
                         'size': 18,
                         'color': '#2ca02c'
                     }
-                    network['nodes'].append(psc_node)
-                    processed_people.add(psc_id)
+                    _append_row(network['nodes'], psc_node)
                 
                 # Add control relationship
                 edge = {
@@ -361,25 +740,246 @@ class CompaniesHouseAPI:
                     'nature_of_control': psc.nature_of_control,
                     'notified_on': psc.notified_on
                 }
-                network['edges'].append(edge)
+                _append_row(network['edges'], edge)
         
         # Update metadata
-        network['metadata']['total_companies'] = len([n for n in network['nodes'] if n['type'] == 'Company'])
-        network['metadata']['total_people'] = len([n for n in network['nodes'] if n['type'] in ['Person', 'PSC']])
+        network['metadata']['total_companies'] = total_companies
+        network['metadata']['total_people'] = len(person_ids) + len(psc_ids)
         
         return network
+    
+    def get_company_network(self, company_name: str, max_companies: int = 10) -> Dict[str, Any]:
+        """
+        Build a network of related companies based on shared directors and PSCs
+        
+        Nodes and edges are returned as column lists (see NODE_COLUMNS and
+        EDGE_COLUMNS); use network_to_records for a list of dicts.
+        
+        Args:
+            company_name (str): Starting company name
+            max_companies (int): Maximum number of companies to include
+            
+        Returns:
+            dict: Network data with columnar nodes and edges
+        """
+        seeds = self._network_seed_companies(company_name, max_companies)
+        
+        # Fetch companies concurrently; the shared rate limiter still paces requests
+        with ThreadPoolExecutor(max_workers=NETWORK_FETCH_WORKERS) as executor:
+            futures = [(cn, executor.submit(self._fetch_company_bundle, cn, profile)) for cn, profile in seeds]
+            
+            # Build the graph on this thread in search order, adding each company
+            # as soon as it arrives while later fetches are still in flight
+            return self._assemble_network(company_name, _bundles_in_order(futures))
+    
+    async def _amake_request(self, client: '_httpx.AsyncClient', endpoint: str,
+                             cache_ttl: Optional[float] = None,
+                             limiter: Optional[asyncio.Semaphore] = None) -> Optional[Dict]:
+        """
+        Make a request to the Companies House API on an async HTTP/2 client
+        
+        Mirrors _make_request; cache reads and writes run on worker threads so
+        SQLite never blocks the event loop.
+        
+        Args:
+            client (httpx.AsyncClient): Client created by get_company_network_async
+            endpoint (str): API endpoint
+            cache_ttl (float): Seconds a cached response stays valid; not cached if None
+            limiter (asyncio.Semaphore): Bounds requests in flight on the event loop
+            
+        Returns:
+            dict: API response data or None if error
+        """
+        if cache_ttl is None:
+            return (await self._afetch(client, endpoint, None, limiter))[0]
+        
+        cache_key = ResponseCache.make_key(self.base_url + endpoint, None)
+        entry = await asyncio.to_thread(self.cache.get_entry, cache_key)
+        if entry is not None and self._is_fresh(entry[0], cache_ttl):
+            return entry[1]
+        
+        data, etag = await self._afetch(client, endpoint, entry[2] if entry is not None else None, limiter)
+        return await asyncio.to_thread(self._store_response, cache_key, entry, data, etag)
+    
+    async def _afetch(self, client: '_httpx.AsyncClient', endpoint: str, etag: Optional[str] = None,
+                      limiter: Optional[asyncio.Semaphore] = None) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Fetch an endpoint on an async HTTP/2 client, bypassing the cache
+        
+        Args:
+            client (httpx.AsyncClient): Client created by get_company_network_async
+            endpoint (str): API endpoint
+            etag (str): ETag of a cached copy, sent as If-None-Match
+            limiter (asyncio.Semaphore): Bounds requests in flight on the event loop
+            
+        Returns:
+            tuple: (API response data, or _NOT_MODIFIED on a 304, or None if error; response ETag)
+        """
+        headers = {'If-None-Match': etag} if etag else None
+        
+        for attempt in range(MAX_RETRIES + 1):
+            # The token bucket and the shared request cap may block, so keep
+            # them off the event loop
+            await asyncio.to_thread(self._rate_limiter.acquire)
+            
+            try:
+                async with limiter or nullcontext():
+                    await asyncio.to_thread(self._concurrency.acquire)
+                    try:
+                        response = await client.get(endpoint, headers=headers)
+                    finally:
+                        self._concurrency.release()
+                result = self._read_response(response, attempt, etag)
+            except (_httpx.HTTPError, orjson.JSONDecodeError) as e:
+                logger.error(f"API request failed: {e}")
+                return None, None
+            
+            if isinstance(result, tuple):
+                return result
+            await asyncio.sleep(result)
+        return None, None
+    
+    async def aget_company_bundle(self, client: '_httpx.AsyncClient', company_number: str,
+                                  profile: Optional[CompanyProfile] = None,
+                                  limiter: Optional[asyncio.Semaphore] = None) -> Tuple[Optional[CompanyProfile], List[Officer], List[PSC]]:
+        """
+        Fetch the profile, officers and PSCs of a company over one HTTP/2 connection
+        
+        Args:
+            client (httpx.AsyncClient): Client created by get_company_network_async
+            company_number (str): Company registration number
+            profile (CompanyProfile): Profile already known from search; fetched if None
+            limiter (asyncio.Semaphore): Bounds requests in flight on the event loop
+            
+        Returns:
+            tuple: (profile, officers, pscs)
+        """
+        pending = [
+            self._amake_request(client, _OFFICERS_PATH(company_number), OFFICERS_CACHE_TTL, limiter),
+            self._amake_request(client, _PSCS_PATH(company_number), PSCS_CACHE_TTL, limiter)
+        ]
+        if profile is None:
+            pending.append(self._amake_request(client, _COMPANY_PATH(company_number), PROFILE_CACHE_TTL, limiter))
+        
+        responses = await asyncio.gather(*pending)
+        if profile is None:
+            profile = self._parse_company_profile(responses[2])
+        return profile, self._parse_officers(responses[0]) or [], self._parse_pscs(responses[1]) or []
+    
+    async def get_company_network_async(self, company_name: str, max_companies: int = 10,
+                                        max_concurrency: int = NETWORK_FETCH_WORKERS) -> Dict[str, Any]:
+        """
+        Build a company network, fetching all companies concurrently
+        
+        With httpx (and h2) installed, each company's requests are multiplexed
+        over a shared HTTP/2 connection; otherwise they run on worker threads
+        through the pooled session. Both paths use the client's rate limiting.
+        
+        Args:
+            company_name (str): Starting company name
+            max_companies (int): Maximum number of companies to include
+            max_concurrency (int): Maximum number of companies (HTTP/2) or
+                requests (threads) in flight
+            
+        Returns:
+            dict: Network data with columnar nodes and edges
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        seeds = await asyncio.to_thread(self._network_seed_companies, company_name, max_companies)
+        
+        if httpx is not None:
+            # Each company issues up to three requests at once, so also cap the
+            # HTTP/2 streams waiting on the key's shared request cap
+            limiter = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            
+            async def fetch_bundle(client, company_number, profile):
+                async with semaphore:
+                    return (company_number, *await self.aget_company_bundle(client, company_number, profile, limiter))
+            
+            # The connection is bound to this event loop, so it lives for one
+            # build; the transport retries connection errors like the session
+            transport = httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+                retries=MAX_RETRIES
+            )
+            async with httpx.AsyncClient(
+                transport=transport,
+                base_url=self.base_url,
+                auth=(self.api_key, ''),
+                headers=DEFAULT_HEADERS,
+                timeout=10
+            ) as client:
+                bundles = await asyncio.gather(*(fetch_bundle(client, cn, profile) for cn, profile in seeds))
+            return self._assemble_network(company_name, bundles)
+        
+        bundles = await asyncio.gather(*(self._aget_company_bundle_threaded(semaphore, cn, profile) for cn, profile in seeds))
+        return self._assemble_network(company_name, bundles)
+    
+    async def _aget_company_bundle_threaded(self, semaphore: asyncio.Semaphore, company_number: str,
+                                            profile: Optional[CompanyProfile] = None) -> Tuple[str, Optional[CompanyProfile], List[Officer], List[PSC]]:
+        """
+        Fetch the profile, officers and PSCs of a company on worker threads
+        
+        Args:
+            semaphore (asyncio.Semaphore): Bounds requests (threads) in flight
+            company_number (str): Company registration number
+            profile (CompanyProfile): Profile already known from search; fetched if None
+            
+        Returns:
+            tuple: (company_number, profile, officers, pscs)
+        """
+        async def fetch(method: Callable[[str], Any]) -> Any:
+            async with semaphore:
+                return await asyncio.to_thread(method, company_number)
+        
+        pending = [fetch(self.get_officers), fetch(self.get_pscs)]
+        if profile is None:
+            pending.append(fetch(self.get_company_profile))
+        
+        officers, pscs, *fetched = await asyncio.gather(*pending)
+        return company_number, fetched[0] if profile is None else profile, officers or [], pscs or []
+
+def _bundles_in_order(futures: List[Tuple[str, Future]]) -> Iterator[Tuple[str, Optional[CompanyProfile], List[Officer], List[PSC]]]:
+    """Yield (company_number, profile, officers, pscs) as each fetch completes, in submission order"""
+    for company_number, future in futures:
+        profile, officers, pscs = future.result()
+        yield company_number, profile, officers, pscs
+
+def _append_row(columns: Dict[str, List[Any]], row: Dict[str, Any]):
+    """Append a record to column lists, filling absent fields with None"""
+    for name, values in columns.items():
+        values.append(row.get(name))
+
+def network_to_records(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert columnar network nodes or edges to a list of dicts
+    
+    Args:
+        columns (dict): network['nodes'] or network['edges']
+        
+    Returns:
+        list: One dict per node or edge
+    """
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a low-cardinality string field so repeated values share one object"""
+    return sys.intern(value) if value else value
+
+def _node_id(prefix: str, key: Tuple[str, ...]) -> str:
+    """Stable network node ID derived from an identity key"""
+    digest = hashlib.blake2b('\x1f'.join(key).encode('utf-8'), digest_size=8).hexdigest()
+    return f"{prefix}_{digest}"
+
+@lru_cache(maxsize=4096)
+def _sic_code_fallback(sic_code: str) -> str:
+    """Generic label for SIC codes missing from _SIC_DESCRIPTIONS"""
+    return f"SIC Code: {sic_code}"
 
 def get_sic_code_description(sic_code: str) -> str:
     """
     Get description for SIC code (simplified mapping)
     """
-    sic_descriptions = {
-        '70100': 'Activities of head offices',
-        '64191': 'Banks',
-        '64209': 'Other credit granting',
-        '68100': 'Buying and selling of own real estate',
-        '68209': 'Other letting and operating of own or leased real estate',
-        '70229': 'Management consultancy activities other than financial management',
-        '82990': 'Other business support service activities n.e.c.'
-    }
-    return sic_descriptions.get(sic_code, f"SIC Code: {sic_code}")
+    return _SIC_DESCRIPTIONS.get(sic_code) or _sic_code_fallback(sic_code)
@@ -0,0 +1,150 @@
+"""
+API Response Cache Module
+
+This module provides a two-level (in-memory and on-disk SQLite) cache for
+Companies House API responses, so repeat lookups skip the network. Entries
+keep the response ETag so stale entries can be revalidated with a
+conditional request.
+"""
+
+import hashlib
+import orjson
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# Entries older than this are dropped; stale but younger entries are kept so
+# they can be revalidated with their ETag
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+
+# Most recently used responses kept in memory per cache
+DEFAULT_MAX_ENTRIES = 4096
+
+class ResponseCache:
+    """
+    Thread-safe cache of API responses with LRU memory and expiring disk entries
+    
+    Responses are stored as orjson bytes and decoded on every lookup, so callers
+    get their own copy and mutating a result never changes the cache.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the response cache
+        
+        Args:
+            path (str): SQLite file for the on-disk cache; memory only if None
+            max_age (float): Seconds after which entries are dropped
+            max_entries (int): Maximum number of responses held in memory
+        """
+        self._memory: OrderedDict[str, Tuple[float, bytes, Optional[str]]] = OrderedDict()
+        self._max_age = max_age
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = None
+        
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, body BLOB NOT NULL, etag TEXT)'
+            )
+            # Caches created before ETags were stored lack the column
+            columns = {row[1] for row in self._db.execute('PRAGMA table_info(responses)')}
+            if 'etag' not in columns:
+                self._db.execute('ALTER TABLE responses ADD COLUMN etag TEXT')
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)')
+            self._db.execute('DELETE FROM responses WHERE stored_at < ?', (time.time() - max_age,))
+            self._db.commit()
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from request parts
+        
+        Args:
+            parts: Values identifying the request (URL, params, ...)
+        
+        Returns:
+            str: Hex digest of the parts
+        """
+        payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _remember(self, key: str, entry: Tuple[float, bytes, Optional[str]]):
+        """Put an entry in the memory layer, evicting the least recently used"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+    
+    def get_entry(self, key: str) -> Optional[Tuple[float, Any, Optional[str]]]:
+        """
+        Get a cached entry, stale or not, unless it has expired
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            tuple: (stored_at, data, etag) or None if missing or expired
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    'SELECT stored_at, body, etag FROM responses WHERE key = ?', (key,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], row[1], row[2])
+                    self._remember(key, entry)
+            
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self._max_age:
+                del self._memory[key]
+                return None
+        
+        return entry[0], orjson.loads(entry[1]), entry[2]
+    
+    def set(self, key: str, data: Any, etag: Optional[str] = None):
+        """
+        Store a response in the cache, dropping expired entries from disk
+        
+        Args:
+            key (str): Cache key
+            data: JSON-serializable response data
+            etag (str): Response ETag used to revalidate the entry once stale
+        """
+        entry = (time.time(), orjson.dumps(data), etag)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses (key, stored_at, body, etag) VALUES (?, ?, ?, ?)',
+                    (key, *entry)
+                )
+                self._db.execute('DELETE FROM responses WHERE stored_at < ?', (entry[0] - self._max_age,))
+                self._db.commit()
+    
+    def touch(self, key: str):
+        """
+        Mark a cached entry as fresh after the API confirmed it is unchanged
+        
+        Args:
+            key (str): Cache key
+        """
+        stored_at = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._remember(key, (stored_at, entry[1], entry[2]))
+            if self._db is not None:
+                self._db.execute('UPDATE responses SET stored_at = ? WHERE key = ?', (stored_at, key))
+                self._db.commit()